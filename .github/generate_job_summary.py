@@ -1,72 +1,105 @@
 import sys
 import json
-import re
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+def _read(path):
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
+def _dumps(o):
+    if orjson is not None:
+        return orjson.dumps(o, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(o, indent=2, sort_keys=False)
+
+# Row templates for the "Summary of Steps" table. These are filled once per
+# step (and once per orc_test run) so keep them as plain %-style formats.
+_STEP_ROW = "| **%s** | | %s %s | | |"
+_TEST_ROW = "| | `%s` | %s | %s | %s |"
+
+# Status marker for each step outcome reported by GitHub Actions. Anything
+# not listed here (e.g., "cancelled") is treated as a failure.
+_OUTCOME_EMOJI = {
+    "success": ":green_circle:",
+    "failure": ":red_circle:",
+    "skipped": ":yellow_circle:",
+}
 
 if __name__ == "__main__":
-    sys.stdout = open(sys.argv[1], "w")
-    github = json.load(open(sys.argv[2], "r"))
-    steps = json.load(open(sys.argv[3], "r"))
-
-    print(f"# {github['workflow']}: Job Summary")
-    print("")
-
-    print("## Details")
-    print(f"- started by: `{github['actor']}`")
-    if "event" in github:
-        event = github['event']
-        if "pull_request" in event:
-            print(f"- branch: `{event['pull_request']['head']['ref']}`")
-        if "action" in event:
-            print(f"- action: `{event['action']}`")
-
-    print("")
-
-    print("## Summary of Steps")
-    print("| Step | Test | Notes | Expected | Reported |")
-    print("|---|---|---|---|---|")
-
-    all_success = True
-    p = re.compile('(?<!\\\\)\'')
-
-    for key in steps:
-        value = steps[key];
-        outcome = value['outcome']
-        cur_success = outcome == 'success'
-        all_success &= cur_success
-        outcome_emoji = ":green_circle:" if cur_success else ":red_circle:"
-        outputs = value['outputs']
-        if outputs == {}:
-            print(f"| **{key}** | | {outcome_emoji} {outcome} | | |")
-        else:
-            if "orc_test_out" in outputs:
-                print(f"| **{key}** | | {outcome_emoji} {outcome} | | |")
-                outputs = p.sub('\"', outputs["orc_test_out"])
-                outputs = json.loads(outputs)
-                for run in outputs:
-                    if isinstance(outputs[run], list):
-                        continue
-                    expected = outputs[run]["expected"]
-                    reported = outputs[run]["reported"]
-                    outcome_emoji = ":green_circle: success" if expected == reported else ":red_circle: failure"
-                    print(f"| | `{run}` | {outcome_emoji} | {expected} | {reported} |")
+    github = _read(sys.argv[2])
+    steps = _read(sys.argv[3])
+
+    lines = []
+
+    # Render inside try/finally so that whatever has been collected still lands
+    # in the job summary if a step has malformed outputs.
+    try:
+        lines.append(f"# {github['workflow']}: Job Summary")
+        lines.append("")
+
+        lines.append("## Details")
+        lines.append(f"- started by: `{github['actor']}`")
+        if "event" in github:
+            event = github['event']
+            if "pull_request" in event:
+                lines.append(f"- branch: `{event['pull_request']['head']['ref']}`")
+            if "action" in event:
+                lines.append(f"- action: `{event['action']}`")
+
+        lines.append("")
+
+        lines.append("## Summary of Steps")
+        lines.append("| Step | Test | Notes | Expected | Reported |")
+        lines.append("|---|---|---|---|---|")
+
+        all_success = True
+        append = lines.append
+
+        for key, value in steps.items():
+            outcome = value['outcome']
+            cur_success = outcome == 'success'
+            all_success &= cur_success
+            outcome_emoji = _OUTCOME_EMOJI.get(outcome, ":red_circle:")
+            outputs = value['outputs']
+            test_out = outputs.get("orc_test_out")
+            if not outputs:
+                append(_STEP_ROW % (key, outcome_emoji, outcome))
             else:
-                print(f"| **{key}** | | {outcome_emoji} {outcome} {outputs} | | |")
-
-    # Keep these for debugging; they can be used to serialize the various
-    # environment variables available to us through GitHub Actions. Be
-    # careful, though, not to leave these in production: they produce
-    # copious (and possibly sensitive) output.
-
-    if False:
-        print("## github")
-        print("<code>")
-        print(json.dumps(github, indent=4, sort_keys=False))
-        print("</code>")
-
-        print("## steps")
-        print("<code>")
-        print(json.dumps(steps, indent=4, sort_keys=False))
-        print("</code>")
+                if test_out is not None:
+                    append(_STEP_ROW % (key, outcome_emoji, outcome))
+                    for run, result in _loads(test_out).items():
+                        if isinstance(result, list):
+                            continue
+                        expected = result["expected"]
+                        reported = result["reported"]
+                        outcome_emoji = ":green_circle: success" if expected == reported else ":red_circle: failure"
+                        append(_TEST_ROW % (run, outcome_emoji, expected, reported))
+                else:
+                    append(_STEP_ROW % (key, outcome_emoji, f"{outcome} {outputs}"))
+
+        # Keep these for debugging; they can be used to serialize the various
+        # environment variables available to us through GitHub Actions. Be
+        # careful, though, not to leave these in production: they produce
+        # copious (and possibly sensitive) output.
+
+        if False:
+            lines.append("## github")
+            lines.append("<code>")
+            lines.append(_dumps(github))
+            lines.append("</code>")
+
+            lines.append("## steps")
+            lines.append("<code>")
+            lines.append(_dumps(steps))
+            lines.append("</code>")
+    finally:
+        with open(sys.argv[1], "wb") as f:
+            f.write(("\n".join(lines) + "\n").encode("utf-8"))
 
     if not all_success:
         sys.exit("One or more tests failed")
@@ -1,6 +1,16 @@
 import sys
 import json
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def _read(path):
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
 if __name__ == "__main__":
-    test_results = json.load(open(sys.argv[1], "r"))
-    print(f"::set-output name=orc_test_out::{test_results}");
+    test_results = _read(sys.argv[1])
+    print(f"::set-output name=orc_test_out::{json.dumps(test_results)}");